@@ -4,10 +4,11 @@ EPUB & Web Article to Markdown Converter - Web GUI
 A Flask-based web interface for converting EPUBs and web articles to AI-optimized Markdown.
 """
 
+import contextlib
 import json
 import os
-import queue
 import shutil
+import subprocess
 import sys
 import tempfile
 import threading
@@ -53,6 +54,11 @@ except ImportError as e:
 # Preferences file location (in user's home directory)
 PREFERENCES_FILE = os.path.join(os.path.expanduser('~'), '.epub2md_preferences.json')
 
+# Process umask, read once at import: reading it means briefly setting it,
+# which isn't safe once request threads are creating files
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
 
 def get_downloads_folder():
     """Get the user's Downloads folder path (cross-platform)"""
@@ -77,8 +83,23 @@ def load_preferences():
 def save_preferences(prefs):
     """Save user preferences to file"""
     try:
-        with open(PREFERENCES_FILE, 'w') as f:
-            json.dump(prefs, f, indent=2)
+        # Write a sibling temp file and rename it over the old one, so a crash
+        # or full disk mid-write can't leave truncated JSON behind.
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(PREFERENCES_FILE) or '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(prefs, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            if os.path.exists(PREFERENCES_FILE):
+                shutil.copymode(PREFERENCES_FILE, tmp_path)
+            else:
+                # mkstemp creates 0600; give a first save the mode open() would
+                os.chmod(tmp_path, 0o666 & ~_UMASK)
+            os.replace(tmp_path, PREFERENCES_FILE)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
         return True
     except Exception as e:
         print(f"Error saving preferences: {e}")
@@ -95,35 +116,41 @@ conversion_status = {
     'completed': False
 }
 
+
+def _job_status(running=False):
+    """Status dict for a single-document job (the URL and PDF tabs)."""
+    return {
+        'running': running,
+        'progress': [],
+        'completed': False,
+        'success': False,
+        'output_file': None,
+        'error': None
+    }
+
+
+def _start_worker(target):
+    """Run a conversion closure on a daemon thread so the route returns at once."""
+    threading.Thread(target=target, daemon=True).start()
+
+
 # Global variables for URL conversion status
-url_conversion_status = {
-    'running': False,
-    'progress': [],
-    'completed': False,
-    'success': False,
-    'output_file': None,
-    'error': None
-}
+url_conversion_status = _job_status()
+# Held by /convert_url from its 'running' check until it resets the status, so
+# two requests arriving together can't both pass the 409 guard
+_url_conversion_start_lock = threading.Lock()
 
 # Global variables for PDF conversion status
-pdf_conversion_status = {
-    'running': False,
-    'progress': [],
-    'completed': False,
-    'success': False,
-    'output_file': None,
-    'error': None
-}
+pdf_conversion_status = _job_status()
+
 
 class OutputCapture:
     """Capture stdout for progress reporting to a status dict."""
     def __init__(self, status_dict):
-        self.queue = queue.Queue()
         self.status_dict = status_dict
 
     def write(self, text):
         if text.strip():
-            self.queue.put(text)
             self.status_dict['progress'].append(text)
         sys.__stdout__.write(text)
 
@@ -131,6 +158,48 @@ class OutputCapture:
         sys.__stdout__.flush()
 
 
+class _ThreadRoutedStdout:
+    """sys.stdout stand-in that sends each worker thread's prints to its own capture.
+
+    sys.stdout is process-wide, so swapping it per job let an EPUB run and a
+    URL/PDF run overlapping in time steal (or restore over) each other's
+    redirect. This is installed once; threads without a capture fall through
+    to the stream it replaced.
+    """
+    def __init__(self, fallback):
+        self.fallback = fallback
+        self.local = threading.local()
+
+    def _target(self):
+        return getattr(self.local, 'capture', None) or self.fallback
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        self._target().flush()
+
+    def __getattr__(self, name):
+        return getattr(self.fallback, name)
+
+
+_stdout_router_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def _capture_output(status_dict):
+    """Route the calling thread's stdout into status_dict['progress'] for the block."""
+    with _stdout_router_lock:
+        if not isinstance(sys.stdout, _ThreadRoutedStdout):
+            sys.stdout = _ThreadRoutedStdout(sys.stdout)
+        router = sys.stdout
+    router.local.capture = OutputCapture(status_dict)
+    try:
+        yield
+    finally:
+        router.local.capture = None
+
+
 def _pending_self_improve_status():
     """Fresh not-yet-run self-improvement status (a poller waits on this)."""
     return {'running': False, 'progress': [], 'evaluated': 0, 'total': 0,
@@ -480,12 +549,8 @@ def convert():
         global conversion_status
         pairs = []
         try:
-            old_stdout = sys.stdout
-            sys.stdout = OutputCapture(conversion_status)
-
-            pairs = process_folder(work_dir, output_folder)
-
-            sys.stdout = old_stdout
+            with _capture_output(conversion_status):
+                pairs = process_folder(work_dir, output_folder)
 
             conversion_status['completed'] = True
             # 'running' stays True through the post-steps (cleared in the
@@ -522,17 +587,32 @@ def convert():
             conversion_status['running'] = False
             shutil.rmtree(work_dir, ignore_errors=True)
 
-    thread = threading.Thread(target=run_conversion)
-    thread.daemon = True
-    thread.start()
+    _start_worker(run_conversion)
 
     return jsonify({'status': 'started', 'count': len(epub_paths)})
 
 
+def _status_response(status_dict):
+    """Serialize a conversion status dict for the frontend pollers.
+
+    With ?since=N only the progress lines past the first N are sent, plus
+    'progress_len' so the poller can ask for the next slice. Long batch logs
+    are then shipped once instead of in full on every poll.
+    """
+    since = request.args.get('since', type=int)
+    if since is None:
+        return jsonify(status_dict)
+    snapshot = dict(status_dict)
+    progress = list(snapshot['progress'])
+    snapshot['progress'] = progress[max(since, 0):]
+    snapshot['progress_len'] = len(progress)
+    return jsonify(snapshot)
+
+
 @app.route('/status')
 def status():
     """Get conversion status"""
-    return jsonify(conversion_status)
+    return _status_response(conversion_status)
 
 
 @app.route('/self_improve_status')
@@ -594,14 +674,16 @@ def browse_folder():
         # Get directory contents
         items = []
         try:
-            for item in sorted(os.listdir(path)):
-                item_path = os.path.join(path, item)
-                if os.path.isdir(item_path):
-                    items.append({
-                        'name': item,
-                        'path': item_path,
-                        'type': 'folder'
-                    })
+            # scandir's entries carry the file type from readdir, so is_dir()
+            # only stats symlinks (which are still followed, as before).
+            with os.scandir(path) as it:
+                folders = sorted((entry for entry in it if entry.is_dir()), key=lambda entry: entry.name)
+            for entry in folders:
+                items.append({
+                    'name': entry.name,
+                    'path': entry.path,
+                    'type': 'folder'
+                })
         except PermissionError:
             pass
 
@@ -707,9 +789,6 @@ def open_folder_dialog_native(initial_dir, title):
     Try to open a native folder dialog using various methods.
     Returns (path, success, error_message)
     """
-    import shutil
-    import subprocess
-
     # Ensure initial_dir exists
     initial_dir = os.path.expanduser(initial_dir)
     if not os.path.exists(initial_dir):
@@ -831,9 +910,6 @@ def open_files_dialog_native(initial_dir, title, extensions):
     Open a native multi-file picker dialog. Returns (paths, success, error).
     `extensions` is a list of lowercase extensions like ['.epub', '.pdf'].
     """
-    import shutil as _shutil
-    import subprocess
-
     initial_dir = os.path.expanduser(initial_dir)
     if not os.path.exists(initial_dir):
         initial_dir = get_downloads_folder()
@@ -842,7 +918,7 @@ def open_files_dialog_native(initial_dir, title, extensions):
 
     # On macOS, prefer osascript: tkinter requires the main thread, but Flask
     # serves requests on worker threads, so tk.Tk() crashes the process there.
-    if is_macos and _shutil.which('osascript'):
+    if is_macos and shutil.which('osascript'):
         try:
             # AppleScript's `of type` clause expects UTIs (Uniform Type Identifiers),
             # not bare extensions. Map known extensions; if any extension isn't
@@ -916,7 +992,7 @@ def open_files_dialog_native(initial_dir, title, extensions):
             pass
 
     # Method 3: zenity (Linux)
-    if _shutil.which('zenity'):
+    if shutil.which('zenity'):
         try:
             ext_filter = ' '.join(f'*{ext}' for ext in extensions)
             result = subprocess.run(
@@ -977,50 +1053,41 @@ def convert_url():
             'error': f'HTML converter not available. Missing dependencies: {", ".join(HTML_DEPENDENCIES_MISSING)}'
         }), 400
 
-    data = request.json
-    url = data.get('url', '').strip()
-    output_folder = data.get('output_folder', 'converted_articles')
-    download_images = data.get('download_images', True)
-    try:
-        page_count = max(1, int(data.get('page_count', 1)))
-    except (TypeError, ValueError):
-        page_count = 1
+    with _url_conversion_start_lock:
+        if url_conversion_status.get('running'):
+            return jsonify({'error': 'Another URL conversion is already running. Wait for it to finish.'}), 409
 
-    if not url:
-        return jsonify({'error': 'URL is required'}), 400
+        data = request.json
+        url = data.get('url', '').strip()
+        output_folder = data.get('output_folder', 'converted_articles')
+        download_images = data.get('download_images', True)
+        try:
+            page_count = max(1, int(data.get('page_count', 1)))
+        except (TypeError, ValueError):
+            page_count = 1
 
-    # Basic URL validation
-    if not url.startswith(('http://', 'https://')):
-        return jsonify({'error': 'URL must start with http:// or https://'}), 400
+        if not url:
+            return jsonify({'error': 'URL is required'}), 400
 
-    # Reset status
-    url_conversion_status = {
-        'running': True,
-        'progress': [],
-        'completed': False,
-        'success': False,
-        'output_file': None,
-        'error': None
-    }
+        # Basic URL validation
+        if not url.startswith(('http://', 'https://')):
+            return jsonify({'error': 'URL must start with http:// or https://'}), 400
+
+        # Reset status
+        url_conversion_status = _job_status(running=True)
 
     # Run conversion in background thread
     def run_url_conversion():
         global url_conversion_status
         try:
-            # Capture output
-            old_stdout = sys.stdout
-            sys.stdout = OutputCapture(url_conversion_status)
-
-            # Run conversion
-            success, message, output_path = convert_url_to_markdown(
-                url=url,
-                output_dir=output_folder,
-                download_images=download_images,
-                page_count=page_count
-            )
-
-            # Restore stdout
-            sys.stdout = old_stdout
+            # Run conversion, capturing its output
+            with _capture_output(url_conversion_status):
+                success, message, output_path = convert_url_to_markdown(
+                    url=url,
+                    output_dir=output_folder,
+                    download_images=download_images,
+                    page_count=page_count
+                )
 
             # Mirror the final outcome into the progress log so it shows up
             # inline (and in Copy Logs), not just in the result banner.
@@ -1042,9 +1109,7 @@ def convert_url():
             url_conversion_status['running'] = False
             url_conversion_status['completed'] = True
 
-    thread = threading.Thread(target=run_url_conversion)
-    thread.daemon = True
-    thread.start()
+    _start_worker(run_url_conversion)
 
     return jsonify({'status': 'started'})
 
@@ -1052,7 +1117,7 @@ def convert_url():
 @app.route('/url_status')
 def url_status():
     """Get URL conversion status"""
-    return jsonify(url_conversion_status)
+    return _status_response(url_conversion_status)
 
 
 # ============================================================
@@ -1100,14 +1165,7 @@ def convert_pdf():
         return jsonify({'error': 'File must be a PDF'}), 400
 
     # Reset status
-    pdf_conversion_status = {
-        'running': True,
-        'progress': [],
-        'completed': False,
-        'success': False,
-        'output_file': None,
-        'error': None
-    }
+    pdf_conversion_status = _job_status(running=True)
 
     # Reset the PDF distill panel for THIS run, synchronously, before the
     # worker can set completed=True (same stale-state guarantee as /convert).
@@ -1117,19 +1175,13 @@ def convert_pdf():
     def run_pdf_conversion():
         global pdf_conversion_status
         try:
-            # Capture output
-            old_stdout = sys.stdout
-            sys.stdout = OutputCapture(pdf_conversion_status)
-
-            # Run conversion
-            success, message, output_path = convert_pdf_to_markdown(
-                pdf_path=pdf_path,
-                output_dir=output_folder,
-                accuracy_critical=accuracy_critical
-            )
-
-            # Restore stdout
-            sys.stdout = old_stdout
+            # Run conversion, capturing its output
+            with _capture_output(pdf_conversion_status):
+                success, message, output_path = convert_pdf_to_markdown(
+                    pdf_path=pdf_path,
+                    output_dir=output_folder,
+                    accuracy_critical=accuracy_critical
+                )
 
             pdf_conversion_status['success'] = success
             pdf_conversion_status['output_file'] = output_path
@@ -1160,9 +1212,7 @@ def convert_pdf():
             _finalize_pending_poststeps('pdf')
             pdf_conversion_status['running'] = False
 
-    thread = threading.Thread(target=run_pdf_conversion)
-    thread.daemon = True
-    thread.start()
+    _start_worker(run_pdf_conversion)
 
     return jsonify({'status': 'started'})
 
@@ -1170,7 +1220,7 @@ def convert_pdf():
 @app.route('/pdf_status')
 def pdf_status():
     """Get PDF conversion status"""
-    return jsonify(pdf_conversion_status)
+    return _status_response(pdf_conversion_status)
 
 
 @app.route('/upload_pdf', methods=['POST'])
@@ -10,7 +10,9 @@ import importlib.util
 import json
 import mimetypes
 import re
+import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Optional
@@ -23,10 +25,12 @@ TRAFILATURA_AVAILABLE = False
 READABILITY_AVAILABLE = False
 REQUESTS_AVAILABLE = False
 BS4_AVAILABLE = False
+LXML_AVAILABLE = False
 SELENIUM_AVAILABLE = False
 
 try:
     import requests
+    from urllib3.util.retry import Retry
     REQUESTS_AVAILABLE = True
 except ImportError:
     pass
@@ -51,6 +55,17 @@ try:
 except ImportError:
     pass
 
+try:
+    import lxml  # noqa: F401  (availability probe)
+    LXML_AVAILABLE = True
+except ImportError:
+    pass
+
+# BeautifulSoup tree builder. lxml (already pulled in by trafilatura and
+# readability-lxml) parses in C and closes implied end tags (<p>, <li>) the way
+# browsers do; the stdlib parser is the fallback.
+_HTML_PARSER = 'lxml' if LXML_AVAILABLE else 'html.parser'
+
 # ============================================================================
 # OPTIONAL: Medium Article Support (via Selenium)
 # Import from separate module for feature flagging and cleaner architecture
@@ -247,6 +262,40 @@ def _is_gift_link(url: str) -> bool:
     return any(p in params for p in gift_params)
 
 
+# Largest page fetch_url() will download. Article HTML is a few MB at most; a
+# bigger body is a video, archive or disk image linked by mistake. Only the
+# declared Content-Length is checked, which is the compressed size when the
+# server gzips the page; chunked responses and ones without a Content-Length
+# are not capped.
+MAX_PAGE_BYTES = 50 * 1024 * 1024
+
+
+def _mount_retrying_adapter(session: "requests.Session", pool_maxsize: int = 10) -> None:
+    """
+    Make ``session`` retry transient gateway errors (502/503/504) with backoff.
+
+    Only those statuses are retried. Connection failures, read timeouts and TLS
+    errors still fail on the first attempt, so a dead server is reported as fast
+    as before, and once retries run out the last 5xx response is returned for
+    the caller's raise_for_status(). ``other=0`` (urllib3 >= 1.26) is what keeps
+    certificate errors from being retried before fetch_url's no-verify fallback.
+    """
+    retry = Retry(
+        total=2,
+        connect=0,
+        read=0,
+        other=0,
+        status=2,
+        backoff_factor=0.5,
+        status_forcelist=(502, 503, 504),
+        raise_on_status=False,
+        respect_retry_after_header=False,
+    )
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=pool_maxsize, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+
 def fetch_url(url: str, timeout: int = 30) -> tuple[Optional[str], Optional[str]]:
     """
     Fetch URL content with proper headers.
@@ -254,6 +303,11 @@ def fetch_url(url: str, timeout: int = 30) -> tuple[Optional[str], Optional[str]
     Handles paywalled sites with session-based requests and
     preserves gift link tokens through redirects.
 
+    Pages whose Content-Length exceeds MAX_PAGE_BYTES are refused before
+    the body is downloaded. The header gives the compressed size, so a
+    gzipped page can decode to more than the limit, and responses without
+    a Content-Length (e.g. chunked transfer encoding) are not capped.
+
     Returns:
         Tuple of (html_content, error_message)
     """
@@ -273,6 +327,7 @@ def fetch_url(url: str, timeout: int = 30) -> tuple[Optional[str], Optional[str]
     try:
         # Use a session to preserve cookies through redirects (important for gift links)
         session = requests.Session()
+        _mount_retrying_adapter(session)
 
         # Enhanced headers for paywalled sites
         headers = dict(DEFAULT_HEADERS)
@@ -288,7 +343,8 @@ def fetch_url(url: str, timeout: int = 30) -> tuple[Optional[str], Optional[str]
                 url,
                 headers=headers,
                 timeout=timeout,
-                allow_redirects=True
+                allow_redirects=True,
+                stream=True
             )
         except requests.exceptions.SSLError:
             # Some sites ship an incomplete/misconfigured certificate chain (missing
@@ -304,45 +360,58 @@ def fetch_url(url: str, timeout: int = 30) -> tuple[Optional[str], Optional[str]
                 headers=headers,
                 timeout=timeout,
                 allow_redirects=True,
-                verify=False
+                verify=False,
+                stream=True
             )
 
-        # For paywalled sites, a 401/403 with a gift link is likely a token issue
-        if response.status_code in (401, 403) and is_paywall:
-            if is_gift:
-                return None, (
-                    f"HTTP {response.status_code}: Gift link may have expired or been used. "
-                    "WSJ gift links are typically single-use. Request a new gift link from the sender."
-                )
-            else:
-                return None, (
-                    f"HTTP {response.status_code}: This article is behind a paywall. "
-                    "To convert paywalled articles, use a gift/share link instead."
-                )
+        # The request is streamed, so close it on every path, including the
+        # early error returns and raise_for_status(), to release the connection
+        with response:
+            # For paywalled sites, a 401/403 with a gift link is likely a token issue
+            if response.status_code in (401, 403) and is_paywall:
+                if is_gift:
+                    return None, (
+                        f"HTTP {response.status_code}: Gift link may have expired or been used. "
+                        "WSJ gift links are typically single-use. Request a new gift link from the sender."
+                    )
+                else:
+                    return None, (
+                        f"HTTP {response.status_code}: This article is behind a paywall. "
+                        "To convert paywalled articles, use a gift/share link instead."
+                    )
+
+            response.raise_for_status()
 
-        response.raise_for_status()
-
-        # Defensive: if the server ignored our Accept-Encoding and sent a
-        # compression requests can't unpack (brotli/zstd without the optional
-        # decoder), the bytes stay compressed and the Content-Encoding header
-        # lingers. Decode it ourselves if possible, else fail clearly instead
-        # of emitting mis-decoded garbage.
-        leftover_enc = response.headers.get('Content-Encoding', '').lower()
-        if 'br' in leftover_enc or 'zstd' in leftover_enc:
-            decoded = _manual_decompress(response.content, leftover_enc)
-            if decoded is None:
-                pkg = 'brotli' if 'br' in leftover_enc else 'zstandard'
+            # An oversized download is refused from its headers, before the body
+            # is read into memory
+            declared_length = response.headers.get('Content-Length', '')
+            if declared_length.isdigit() and int(declared_length) > MAX_PAGE_BYTES:
                 return None, (
-                    f"Server returned {leftover_enc}-compressed content that could not be "
-                    f"decoded. Install the optional decoder with: pip install {pkg}"
+                    f"Page is too large to convert ({int(declared_length) // (1024 * 1024)} MB; "
+                    f"limit is {MAX_PAGE_BYTES // (1024 * 1024)} MB). Is the URL a file rather than an article?"
                 )
-            content = sanitize_html(decoded.decode('utf-8', errors='replace'))
-        else:
-            # Try to detect encoding
-            response.encoding = response.apparent_encoding or 'utf-8'
 
-            # Sanitize HTML to remove control characters
-            content = sanitize_html(response.text)
+            # Defensive: if the server ignored our Accept-Encoding and sent a
+            # compression requests can't unpack (brotli/zstd without the optional
+            # decoder), the bytes stay compressed and the Content-Encoding header
+            # lingers. Decode it ourselves if possible, else fail clearly instead
+            # of emitting mis-decoded garbage.
+            leftover_enc = response.headers.get('Content-Encoding', '').lower()
+            if 'br' in leftover_enc or 'zstd' in leftover_enc:
+                decoded = _manual_decompress(response.content, leftover_enc)
+                if decoded is None:
+                    pkg = 'brotli' if 'br' in leftover_enc else 'zstandard'
+                    return None, (
+                        f"Server returned {leftover_enc}-compressed content that could not be "
+                        f"decoded. Install the optional decoder with: pip install {pkg}"
+                    )
+                content = sanitize_html(decoded.decode('utf-8', errors='replace'))
+            else:
+                # Try to detect encoding
+                response.encoding = response.apparent_encoding or 'utf-8'
+
+                # Sanitize HTML to remove control characters
+                content = sanitize_html(response.text)
 
         # Check if paywalled content was truncated
         if is_paywall and content:
@@ -378,7 +447,28 @@ def fetch_url(url: str, timeout: int = 30) -> tuple[Optional[str], Optional[str]
         return None, f"Request failed: {str(e)}"
 
 
-def extract_json_ld_metadata(html_content: str) -> dict[str, Any]:
+def _json_ld_blocks(soup: "BeautifulSoup") -> list[Any]:
+    """
+    Return the decoded JSON-LD <script> blocks of a page.
+
+    The result is cached on the soup, so extractors sharing one parse of the
+    page (see convert_url_to_markdown) decode each block only once. Blocks
+    that are empty or not valid JSON are skipped.
+    """
+    # Read through __dict__: attribute lookups on a Tag fall back to find()
+    blocks = soup.__dict__.get('_json_ld_blocks')
+    if blocks is None:
+        blocks = []
+        for script in soup.find_all('script', type='application/ld+json'):
+            try:
+                blocks.append(json.loads(script.string))
+            except (json.JSONDecodeError, TypeError):
+                continue
+        soup._json_ld_blocks = blocks
+    return blocks
+
+
+def extract_json_ld_metadata(html_content: str, soup: Optional["BeautifulSoup"] = None) -> dict[str, Any]:
     """Extract metadata from JSON-LD structured data."""
     metadata = {}
 
@@ -386,15 +476,11 @@ def extract_json_ld_metadata(html_content: str) -> dict[str, Any]:
         return metadata
 
     try:
-        soup = BeautifulSoup(html_content, 'html.parser')
-
-        # Find all JSON-LD scripts
-        json_ld_scripts = soup.find_all('script', type='application/ld+json')
+        if soup is None:
+            soup = BeautifulSoup(html_content, _HTML_PARSER)
 
-        for script in json_ld_scripts:
+        for data in _json_ld_blocks(soup):
             try:
-                data = json.loads(script.string)
-
                 # Handle @graph structure
                 if '@graph' in data:
                     for item in data['@graph']:
@@ -402,7 +488,7 @@ def extract_json_ld_metadata(html_content: str) -> dict[str, Any]:
                 else:
                     metadata.update(parse_json_ld_item(data))
 
-            except (json.JSONDecodeError, TypeError):
+            except TypeError:
                 continue
 
     except Exception:
@@ -467,7 +553,7 @@ def parse_json_ld_item(item: dict) -> dict[str, Any]:
     return metadata
 
 
-def extract_opengraph_metadata(html_content: str) -> dict[str, Any]:
+def extract_opengraph_metadata(html_content: str, soup: Optional["BeautifulSoup"] = None) -> dict[str, Any]:
     """Extract metadata from OpenGraph and Twitter meta tags."""
     metadata = {}
 
@@ -475,7 +561,8 @@ def extract_opengraph_metadata(html_content: str) -> dict[str, Any]:
         return metadata
 
     try:
-        soup = BeautifulSoup(html_content, 'html.parser')
+        if soup is None:
+            soup = BeautifulSoup(html_content, _HTML_PARSER)
 
         # OpenGraph tags
         og_mappings = {
@@ -528,7 +615,11 @@ def extract_opengraph_metadata(html_content: str) -> dict[str, Any]:
     return metadata
 
 
-def extract_tags_and_topics(html_content: str) -> list[str]:
+# Class names of tag/topic links and labels
+_TAG_CLASS_RE = re.compile(r'tag|topic|category', re.I)
+
+
+def extract_tags_and_topics(html_content: str, soup: Optional["BeautifulSoup"] = None) -> list[str]:
     """Extract tags, topics, categories from the article."""
     tags = set()
 
@@ -536,45 +627,42 @@ def extract_tags_and_topics(html_content: str) -> list[str]:
         return []
 
     try:
-        soup = BeautifulSoup(html_content, 'html.parser')
+        if soup is None:
+            soup = BeautifulSoup(html_content, _HTML_PARSER)
 
         # JSON-LD keywords
-        for script in soup.find_all('script', type='application/ld+json'):
-            try:
-                data = json.loads(script.string)
-                if isinstance(data, dict):
-                    keywords = data.get('keywords', [])
-                    if isinstance(keywords, str):
-                        tags.update(k.strip() for k in keywords.split(','))
-                    elif isinstance(keywords, list):
-                        tags.update(str(k).strip() for k in keywords)
-            except (json.JSONDecodeError, TypeError):
-                continue
+        for data in _json_ld_blocks(soup):
+            if isinstance(data, dict):
+                keywords = data.get('keywords', [])
+                if isinstance(keywords, str):
+                    tags.update(k.strip() for k in keywords.split(','))
+                elif isinstance(keywords, list):
+                    tags.update(str(k).strip() for k in keywords)
 
         # Meta keywords
         meta_keywords = soup.find('meta', attrs={'name': 'keywords'})
         if meta_keywords and meta_keywords.get('content'):
             tags.update(k.strip() for k in meta_keywords['content'].split(','))
 
-        # Article tags (common patterns)
-        tag_selectors = [
-            ('a', {'rel': 'tag'}),
-            ('a', {'class': re.compile(r'tag|topic|category', re.I)}),
-            ('span', {'class': re.compile(r'tag|topic|category', re.I)}),
-            ('li', {'class': re.compile(r'tag|topic|category', re.I)}),
-        ]
+        # One pass over the tree for both article tag links/labels (<a rel="tag">,
+        # a/span/li with a tag-like class) and OpenGraph article:tag metas
+        for elem in soup.find_all(['a', 'span', 'li', 'meta']):
+            if elem.name == 'meta':
+                if elem.get('property') == 'article:tag' and elem.get('content'):
+                    tags.add(elem['content'].strip())
+                continue
 
-        for tag_name, attrs in tag_selectors:
-            for elem in soup.find_all(tag_name, attrs):
+            rel = elem.get('rel') if elem.name == 'a' else None
+            classes = elem.get('class')
+            if isinstance(rel, str):
+                rel = [rel]
+            if isinstance(classes, list):
+                classes = ' '.join(classes)
+            if (rel and 'tag' in rel) or (classes and _TAG_CLASS_RE.search(classes)):
                 text = elem.get_text(strip=True)
                 if text and len(text) < 50:  # Sanity check
                     tags.add(text)
 
-        # OpenGraph article tags
-        for meta in soup.find_all('meta', property='article:tag'):
-            if meta.get('content'):
-                tags.add(meta['content'].strip())
-
         # Clean up tags
         cleaned_tags = []
         for tag in tags:
@@ -588,6 +676,10 @@ def extract_tags_and_topics(html_content: str) -> list[str]:
     return sorted(set(cleaned_tags))[:20]  # Limit to 20 tags
 
 
+_TOC_CLASS_RE = re.compile(r'toc|table-of-contents', re.I)
+_CONTENT_CLASS_RE = re.compile(r'content|post|article', re.I)
+
+
 def extract_table_of_contents(html_content: str) -> list[dict[str, Any]]:
     """Extract table of contents from headings in the article."""
     toc = []
@@ -596,13 +688,13 @@ def extract_table_of_contents(html_content: str) -> list[dict[str, Any]]:
         return toc
 
     try:
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = BeautifulSoup(html_content, _HTML_PARSER)
 
         # First, try to find an explicit TOC
         toc_selectors = [
-            ('nav', {'class': re.compile(r'toc|table-of-contents', re.I)}),
-            ('div', {'class': re.compile(r'toc|table-of-contents', re.I)}),
-            ('ul', {'class': re.compile(r'toc|table-of-contents', re.I)}),
+            ('nav', {'class': _TOC_CLASS_RE}),
+            ('div', {'class': _TOC_CLASS_RE}),
+            ('ul', {'class': _TOC_CLASS_RE}),
         ]
 
         for tag_name, attrs in toc_selectors:
@@ -617,7 +709,7 @@ def extract_table_of_contents(html_content: str) -> list[dict[str, Any]]:
 
         # If no explicit TOC, build from headings
         # Find article content first
-        article = soup.find('article') or soup.find('main') or soup.find('div', class_=re.compile(r'content|post|article', re.I))
+        article = soup.find('article') or soup.find('main') or soup.find('div', class_=_CONTENT_CLASS_RE)
         search_area = article if article else soup
 
         for heading in search_area.find_all(['h1', 'h2', 'h3', 'h4']):
@@ -649,6 +741,10 @@ def format_toc_for_markdown(toc: list[dict[str, Any]], title: str = None) -> str
     return '\n'.join(lines) + '\n'
 
 
+# Markdown headings: ## Heading or ### Heading etc.
+_MD_HEADING_RE = re.compile(r'^(#{1,6})\s+(.+)$', re.MULTILINE)
+
+
 def extract_toc_from_markdown(markdown_content: str) -> list[dict[str, Any]]:
     """
     Extract table of contents from markdown headings.
@@ -656,10 +752,7 @@ def extract_toc_from_markdown(markdown_content: str) -> list[dict[str, Any]]:
     """
     toc = []
 
-    # Match markdown headings: ## Heading or ### Heading etc.
-    heading_pattern = re.compile(r'^(#{1,6})\s+(.+)$', re.MULTILINE)
-
-    for match in heading_pattern.finditer(markdown_content):
+    for match in _MD_HEADING_RE.finditer(markdown_content):
         level = len(match.group(1))
         text = match.group(2).strip()
 
@@ -681,7 +774,7 @@ def extract_toc_from_markdown(markdown_content: str) -> list[dict[str, Any]]:
     return toc
 
 
-def extract_spa_metadata(html_content: str, url: str) -> dict[str, Any]:
+def extract_spa_metadata(html_content: str, url: str, soup: Optional["BeautifulSoup"] = None) -> dict[str, Any]:
     """
     Extract metadata from modern SPA (Single Page Application) sites.
     Handles sites like Heavybit, Medium, Substack that use React/Vue/etc.
@@ -692,7 +785,8 @@ def extract_spa_metadata(html_content: str, url: str) -> dict[str, Any]:
         return metadata
 
     try:
-        soup = BeautifulSoup(html_content, 'html.parser')
+        if soup is None:
+            soup = BeautifulSoup(html_content, _HTML_PARSER)
 
         # ===== TITLE: Look for h1 with specific patterns =====
         h1 = soup.find('h1')
@@ -952,7 +1046,16 @@ def extract_spa_metadata(html_content: str, url: str) -> dict[str, Any]:
     return metadata
 
 
-def extract_html_metadata(html_content: str, url: str) -> dict[str, Any]:
+# Author/date selectors for extract_html_metadata()
+_AUTHOR_NAME_CLASS_RE = re.compile(r'author-name|authorName|author__name', re.I)
+_AUTHOR_CLASS_RE = re.compile(r'^author$|byline-author', re.I)
+_BYLINE_CLASS_RE = re.compile(r'^author$|byline', re.I)
+_PERSON_TYPE_RE = re.compile(r'Person', re.I)
+_BY_PREFIX_RE = re.compile(r'^(by|written by|author:?|posted by)\s*', re.I)
+_DATE_CLASS_RE = re.compile(r'date|publish|posted', re.I)
+
+
+def extract_html_metadata(html_content: str, url: str, soup: Optional["BeautifulSoup"] = None) -> dict[str, Any]:
     """Extract metadata by parsing HTML structure."""
     metadata = {}
 
@@ -960,7 +1063,8 @@ def extract_html_metadata(html_content: str, url: str) -> dict[str, Any]:
         return metadata
 
     try:
-        soup = BeautifulSoup(html_content, 'html.parser')
+        if soup is None:
+            soup = BeautifulSoup(html_content, _HTML_PARSER)
 
         # ===== TITLE EXTRACTION =====
         # Priority 1: h1 tag (usually the main title)
@@ -994,17 +1098,17 @@ def extract_html_metadata(html_content: str, url: str) -> dict[str, Any]:
             # Rel author
             ('a', {'rel': 'author'}),
             # Class-based selectors (common patterns)
-            ('span', {'class': re.compile(r'author-name|authorName|author__name', re.I)}),
-            ('a', {'class': re.compile(r'author-name|authorName|author__name', re.I)}),
-            ('div', {'class': re.compile(r'author-name|authorName|author__name', re.I)}),
-            ('span', {'class': re.compile(r'^author$|byline-author', re.I)}),
-            ('div', {'class': re.compile(r'^author$|byline-author', re.I)}),
-            ('p', {'class': re.compile(r'^author$|byline', re.I)}),
+            ('span', {'class': _AUTHOR_NAME_CLASS_RE}),
+            ('a', {'class': _AUTHOR_NAME_CLASS_RE}),
+            ('div', {'class': _AUTHOR_NAME_CLASS_RE}),
+            ('span', {'class': _AUTHOR_CLASS_RE}),
+            ('div', {'class': _AUTHOR_CLASS_RE}),
+            ('p', {'class': _BYLINE_CLASS_RE}),
             # Data attributes
             ('*', {'data-author': True}),
             # Itemprop
             ('*', {'itemprop': 'author'}),
-            ('*', {'itemprop': 'name', 'itemtype': re.compile(r'Person', re.I)}),
+            ('*', {'itemprop': 'name', 'itemtype': _PERSON_TYPE_RE}),
         ]
 
         for tag, attrs in author_selectors:
@@ -1020,7 +1124,7 @@ def extract_html_metadata(html_content: str, url: str) -> dict[str, Any]:
                         author = elem.get_text(strip=True)
 
                     # Clean up common prefixes
-                    author = re.sub(r'^(by|written by|author:?|posted by)\s*', '', author, flags=re.I)
+                    author = _BY_PREFIX_RE.sub('', author)
                     author = author.strip()
 
                     if author and len(author) > 1 and len(author) < 100:
@@ -1038,9 +1142,9 @@ def extract_html_metadata(html_content: str, url: str) -> dict[str, Any]:
             ('meta', {'name': 'pubdate'}),
             ('meta', {'itemprop': 'datePublished'}),
             # Class-based
-            ('span', {'class': re.compile(r'date|publish|posted', re.I)}),
-            ('div', {'class': re.compile(r'date|publish|posted', re.I)}),
-            ('p', {'class': re.compile(r'date|publish|posted', re.I)}),
+            ('span', {'class': _DATE_CLASS_RE}),
+            ('div', {'class': _DATE_CLASS_RE}),
+            ('p', {'class': _DATE_CLASS_RE}),
             # Itemprop
             ('*', {'itemprop': 'datePublished'}),
         ]
@@ -1126,7 +1230,7 @@ def preprocess_medium_html(html_content: str) -> str:
         return html_content
 
     try:
-        soup = BeautifulSoup(html_content, 'html.parser')
+        soup = BeautifulSoup(html_content, _HTML_PARSER)
 
         # Medium responses section patterns
         # Pattern 1: Section containing "Responses" text anywhere
@@ -1193,6 +1297,12 @@ def preprocess_medium_html(html_content: str) -> str:
         return html_content
 
 
+# Article-body containers for the BeautifulSoup fallback in extract_article_content()
+_ARTICLE_BODY_CLASS_RE = re.compile(r'article-content|post-content|entry-content', re.I)
+_PROSE_CLASS_RE = re.compile(r'prose|markdown|rich-text', re.I)
+_SPA_BODY_CLASS_RE = re.compile(r'font-plexsans|article-body', re.I)
+
+
 def extract_article_content(html_content: str, url: str) -> tuple[Optional[str], dict[str, Any]]:
     """
     Extract main article content from HTML.
@@ -1315,7 +1425,7 @@ def extract_article_content(html_content: str, url: str) -> tuple[Optional[str],
     if BS4_AVAILABLE and not content:
         print("      Trying BeautifulSoup fallback...")
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = BeautifulSoup(html_content, _HTML_PARSER)
 
             # Remove unwanted elements (expanded list for SPAs)
             for tag in soup.find_all(['nav', 'header', 'footer', 'aside', 'script',
@@ -1328,12 +1438,12 @@ def extract_article_content(html_content: str, url: str) -> tuple[Optional[str],
             selectors = [
                 ('div', {'id': 'content'}),
                 ('div', {'id': 'article-content'}),
-                ('div', {'class': re.compile(r'article-content|post-content|entry-content', re.I)}),
+                ('div', {'class': _ARTICLE_BODY_CLASS_RE}),
                 ('article', {}),
                 ('main', {}),
-                ('div', {'class': re.compile(r'prose|markdown|rich-text', re.I)}),
+                ('div', {'class': _PROSE_CLASS_RE}),
                 # Heavybit and similar SPA patterns
-                ('div', {'class': re.compile(r'font-plexsans|article-body', re.I)}),
+                ('div', {'class': _SPA_BODY_CLASS_RE}),
             ]
 
             for tag_name, attrs in selectors:
@@ -1389,102 +1499,139 @@ def extract_article_content(html_content: str, url: str) -> tuple[Optional[str],
     return content, metadata
 
 
+# Regex fallback used by html_to_simple_markdown() when BeautifulSoup is missing
+_SCRIPT_BLOCK_RE = re.compile(r'<script[^>]*>.*?</script>', re.DOTALL | re.I)
+_STYLE_BLOCK_RE = re.compile(r'<style[^>]*>.*?</style>', re.DOTALL | re.I)
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_MULTI_NEWLINE_RE = re.compile(r'\n{3,}')
+_INLINE_SPACE_RE = re.compile(r'[ \t]+')
+
+# Elements html_to_simple_markdown() rewrites, mapped to the pass that handles them
+_HEADING_LEVELS = {f'h{level}': level for level in range(1, 7)}
+_SIMPLE_MD_PASS = {name: level - 1 for name, level in _HEADING_LEVELS.items()}
+_SIMPLE_MD_PASS.update({
+    'p': 6, 'strong': 7, 'b': 7, 'em': 8, 'i': 8, 'a': 9,
+    'ul': 10, 'ol': 11, 'blockquote': 12, 'pre': 13, 'code': 14,
+})
+_SIMPLE_MD_PASS_COUNT = max(_SIMPLE_MD_PASS.values()) + 1
+
+
 def html_to_simple_markdown(html_content: str) -> str:
     """Convert HTML to simple markdown (basic implementation)."""
     if not BS4_AVAILABLE:
         # Very basic regex-based conversion
-        text = re.sub(r'<script[^>]*>.*?</script>', '', html_content, flags=re.DOTALL | re.I)
-        text = re.sub(r'<style[^>]*>.*?</style>', '', text, flags=re.DOTALL | re.I)
-        text = re.sub(r'<[^>]+>', '', text)
+        text = _SCRIPT_BLOCK_RE.sub('', html_content)
+        text = _STYLE_BLOCK_RE.sub('', text)
+        text = _HTML_TAG_RE.sub('', text)
         text = html.unescape(text)
         return text.strip()
 
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = BeautifulSoup(html_content, _HTML_PARSER)
+
+    # Collect every element to rewrite in one traversal, bucketed by pass.
+    # Passes run in the fixed order below because each one flattens its
+    # elements to text, so earlier passes decide what later ones still see.
+    passes = [[] for _ in range(_SIMPLE_MD_PASS_COUNT)]
+    for elem in soup.descendants:
+        pass_index = _SIMPLE_MD_PASS.get(elem.name)
+        if pass_index is not None:
+            passes[pass_index].append(elem)
+
+    def attached(elem) -> bool:
+        # False once an ancestor has been flattened by an earlier rewrite
+        while elem.parent is not None:
+            elem = elem.parent
+        return elem is soup
+
+    for bucket in passes:
+        for elem in bucket:
+            if not attached(elem):
+                continue
+            name = elem.name
 
-    # Process headings
-    for i in range(1, 7):
-        for heading in soup.find_all(f'h{i}'):
-            text = heading.get_text(strip=True)
-            heading.replace_with(f"\n\n{'#' * i} {text}\n\n")
-
-    # Process paragraphs
-    for p in soup.find_all('p'):
-        text = p.get_text(strip=True)
-        p.replace_with(f"\n\n{text}\n\n")
-
-    # Process bold
-    for b in soup.find_all(['strong', 'b']):
-        text = b.get_text(strip=True)
-        b.replace_with(f"**{text}**")
-
-    # Process italic
-    for i in soup.find_all(['em', 'i']):
-        text = i.get_text(strip=True)
-        i.replace_with(f"*{text}*")
-
-    # Process links
-    for a in soup.find_all('a'):
-        text = a.get_text(strip=True)
-        href = a.get('href', '')
-        if href and text:
-            a.replace_with(f"[{text}]({href})")
-        elif text:
-            a.replace_with(text)
-
-    # Process lists
-    for ul in soup.find_all('ul'):
-        items = []
-        for li in ul.find_all('li', recursive=False):
-            items.append(f"- {li.get_text(strip=True)}")
-        ul.replace_with('\n' + '\n'.join(items) + '\n')
-
-    for ol in soup.find_all('ol'):
-        items = []
-        for idx, li in enumerate(ol.find_all('li', recursive=False), 1):
-            items.append(f"{idx}. {li.get_text(strip=True)}")
-        ol.replace_with('\n' + '\n'.join(items) + '\n')
-
-    # Process blockquotes
-    for bq in soup.find_all('blockquote'):
-        text = bq.get_text(strip=True)
-        lines = text.split('\n')
-        quoted = '\n'.join(f"> {line}" for line in lines)
-        bq.replace_with(f"\n\n{quoted}\n\n")
-
-    # Process code blocks
-    for pre in soup.find_all('pre'):
-        code = pre.find('code')
-        if code:
-            text = code.get_text()
-            lang = ''
-            if code.get('class'):
-                for cls in code.get('class', []):
-                    if cls.startswith('language-'):
-                        lang = cls.replace('language-', '')
-                        break
-            pre.replace_with(f"\n\n```{lang}\n{text}\n```\n\n")
-        else:
-            text = pre.get_text()
-            pre.replace_with(f"\n\n```\n{text}\n```\n\n")
+            if name in _HEADING_LEVELS:
+                text = elem.get_text(strip=True)
+                elem.replace_with(f"\n\n{'#' * _HEADING_LEVELS[name]} {text}\n\n")
+
+            elif name == 'p':
+                text = elem.get_text(strip=True)
+                elem.replace_with(f"\n\n{text}\n\n")
 
-    # Process inline code
-    for code in soup.find_all('code'):
-        if code.parent and code.parent.name != 'pre':
-            text = code.get_text(strip=True)
-            code.replace_with(f"`{text}`")
+            elif name in ('strong', 'b'):
+                text = elem.get_text(strip=True)
+                elem.replace_with(f"**{text}**")
+
+            elif name in ('em', 'i'):
+                text = elem.get_text(strip=True)
+                elem.replace_with(f"*{text}*")
 
-    # Get text and clean up
+            elif name == 'a':
+                text = elem.get_text(strip=True)
+                href = elem.get('href', '')
+                if href and text:
+                    elem.replace_with(f"[{text}]({href})")
+                elif text:
+                    elem.replace_with(text)
+
+            elif name == 'ul':
+                items = []
+                for li in elem.find_all('li', recursive=False):
+                    items.append(f"- {li.get_text(strip=True)}")
+                elem.replace_with('\n' + '\n'.join(items) + '\n')
+
+            elif name == 'ol':
+                items = []
+                for idx, li in enumerate(elem.find_all('li', recursive=False), 1):
+                    items.append(f"{idx}. {li.get_text(strip=True)}")
+                elem.replace_with('\n' + '\n'.join(items) + '\n')
+
+            elif name == 'blockquote':
+                text = elem.get_text(strip=True)
+                lines = text.split('\n')
+                quoted = '\n'.join(f"> {line}" for line in lines)
+                elem.replace_with(f"\n\n{quoted}\n\n")
+
+            elif name == 'pre':
+                code = elem.find('code')
+                if code:
+                    text = code.get_text()
+                    lang = ''
+                    if code.get('class'):
+                        for cls in code.get('class', []):
+                            if cls.startswith('language-'):
+                                lang = cls.replace('language-', '')
+                                break
+                    elem.replace_with(f"\n\n```{lang}\n{text}\n```\n\n")
+                else:
+                    text = elem.get_text()
+                    elem.replace_with(f"\n\n```\n{text}\n```\n\n")
+
+            elif name == 'code':
+                # Inline code only; block code was handled with its <pre>
+                if elem.parent.name != 'pre':
+                    text = elem.get_text(strip=True)
+                    elem.replace_with(f"`{text}`")
+
+    # Get text and clean up. The parser has already decoded entities, so the
+    # text is not unescaped again (that turned a literal "&amp;lt;" into "<")
     text = soup.get_text()
-    text = html.unescape(text)
 
     # Clean up whitespace
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    text = re.sub(r'[ \t]+', ' ', text)
+    text = _MULTI_NEWLINE_RE.sub('\n\n', text)
+    text = _INLINE_SPACE_RE.sub(' ', text)
 
     return text.strip()
 
 
-def extract_images(html_content: str, base_url: str) -> list[dict[str, str]]:
+# srcset widths ("800w" -> 800) and CSS background images for extract_images()
+_NON_DIGIT_RE = re.compile(r'\D')
+_BACKGROUND_STYLE_RE = re.compile(r'background(-image)?:\s*url', re.I)
+_CSS_URL_RE = re.compile(r'url\(["\']?([^"\')\s]+)["\']?\)')
+# Parsers lowercase tag names, so probe the raw HTML case-insensitively
+_IMG_TAG_RE = re.compile(r'<img', re.I)
+
+
+def extract_images(html_content: str, base_url: str, soup: Optional["BeautifulSoup"] = None) -> list[dict[str, str]]:
     """
     Extract image information from HTML content.
     Enhanced for SPA sites with og:image fallback and CDN handling.
@@ -1496,10 +1643,13 @@ def extract_images(html_content: str, base_url: str) -> list[dict[str, str]]:
         return images
 
     try:
-        soup = BeautifulSoup(html_content, 'html.parser')
+        if soup is None:
+            soup = BeautifulSoup(html_content, _HTML_PARSER)
 
+        # Each tree walk below is skipped when the raw HTML cannot contain what
+        # it looks for; a miss would otherwise walk the whole document.
         # ===== Priority 1: OpenGraph image (often the best quality main image) =====
-        og_image = soup.find('meta', property='og:image')
+        og_image = soup.find('meta', property='og:image') if 'og:image' in html_content else None
         if og_image and og_image.get('content'):
             og_url = og_image['content']
             if og_url and og_url not in seen_urls:
@@ -1512,7 +1662,7 @@ def extract_images(html_content: str, base_url: str) -> list[dict[str, str]]:
                 })
 
         # ===== Priority 2: Twitter card image (backup for og:image) =====
-        if not images:
+        if not images and 'twitter:image' in html_content:
             twitter_image = soup.find('meta', attrs={'name': 'twitter:image'})
             if twitter_image and twitter_image.get('content'):
                 tw_url = twitter_image['content']
@@ -1526,7 +1676,8 @@ def extract_images(html_content: str, base_url: str) -> list[dict[str, str]]:
                     })
 
         # ===== Find all img tags with extended attribute checking =====
-        for img in soup.find_all('img'):
+        img_tags = soup.find_all('img') if _IMG_TAG_RE.search(html_content) else []
+        for img in img_tags:
             # Check multiple src attributes (for lazy loading patterns)
             src = None
             for attr in ['src', 'data-src', 'data-lazy-src', 'data-original',
@@ -1547,7 +1698,7 @@ def extract_images(html_content: str, base_url: str) -> list[dict[str, str]]:
                         url_part, size_part = part.rsplit(' ', 1)
                         # Extract width from size (e.g., "800w" -> 800)
                         try:
-                            width = int(re.sub(r'\D', '', size_part))
+                            width = int(_NON_DIGIT_RE.sub('', size_part))
                             if width > max_width:
                                 max_width = width
                                 src = url_part.strip()
@@ -1564,7 +1715,8 @@ def extract_images(html_content: str, base_url: str) -> list[dict[str, str]]:
                 src = urljoin(base_url, src)
 
             # Skip data URLs and tracking pixels
-            if src.startswith('data:') or '1x1' in src or 'pixel' in src.lower():
+            src_lower = src.lower()
+            if src.startswith('data:') or '1x1' in src or 'pixel' in src_lower:
                 continue
 
             # Skip if already seen
@@ -1576,8 +1728,8 @@ def extract_images(html_content: str, base_url: str) -> list[dict[str, str]]:
             title = img.get('title', '')
 
             # Skip tiny images (likely icons), but be lenient with CDN images
-            is_cdn = any(cdn in src.lower() for cdn in ['sanity', 'cloudinary', 'imgix',
-                                                          'cloudfront', 'cdn', 'unsplash'])
+            is_cdn = any(cdn in src_lower for cdn in ['sanity', 'cloudinary', 'imgix',
+                                                       'cloudfront', 'cdn', 'unsplash'])
             width = img.get('width', '')
             height = img.get('height', '')
             try:
@@ -1600,10 +1752,11 @@ def extract_images(html_content: str, base_url: str) -> list[dict[str, str]]:
             })
 
         # ===== Check for background images in style attributes (common in SPAs) =====
-        for elem in soup.find_all(style=re.compile(r'background(-image)?:\s*url', re.I)):
+        styled = soup.find_all(style=_BACKGROUND_STYLE_RE) if _BACKGROUND_STYLE_RE.search(html_content) else []
+        for elem in styled:
             style = elem.get('style', '')
             # Extract URL from background-image: url(...)
-            match = re.search(r'url\(["\']?([^"\')\s]+)["\']?\)', style)
+            match = _CSS_URL_RE.search(style)
             if match:
                 bg_url = match.group(1)
                 if not bg_url.startswith(('http://', 'https://')):
@@ -1622,10 +1775,20 @@ def extract_images(html_content: str, base_url: str) -> list[dict[str, str]]:
     return images
 
 
-def download_image(image_url: str, output_dir: Path, base_name: str, index: int) -> tuple[Optional[str], Optional[str]]:
+def download_image(
+    image_url: str,
+    output_dir: Path,
+    base_name: str,
+    index: int,
+    session: Optional["requests.Session"] = None
+) -> tuple[Optional[str], Optional[str]]:
     """
     Download an image and save it locally.
 
+    Pass a shared ``session`` when downloading several images so requests to
+    the same host reuse one kept-alive connection instead of a new TCP/TLS
+    handshake each.
+
     Returns:
         Tuple of (local_path, error_message)
     """
@@ -1633,28 +1796,32 @@ def download_image(image_url: str, output_dir: Path, base_name: str, index: int)
         return None, "requests library not available"
 
     try:
-        response = requests.get(
+        response = (session or requests).get(
             image_url,
             headers=DEFAULT_HEADERS,
             timeout=30,
             stream=True
         )
-        response.raise_for_status()
-
-        # Determine file extension
-        content_type = response.headers.get('content-type', '')
-        ext = mimetypes.guess_extension(content_type.split(';')[0]) or '.jpg'
-        if ext == '.jpe':
-            ext = '.jpg'
-
-        # Create filename
-        filename = f"{base_name} - Figure {index}{ext}"
-        filepath = output_dir / filename
-
-        # Download
-        with open(filepath, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        try:
+            response.raise_for_status()
+
+            # Determine file extension
+            content_type = response.headers.get('content-type', '')
+            ext = mimetypes.guess_extension(content_type.split(';')[0]) or '.jpg'
+            if ext == '.jpe':
+                ext = '.jpg'
+
+            # Create filename
+            filename = f"{base_name} - Figure {index}{ext}"
+            filepath = output_dir / filename
+
+            # Download: copy the raw stream in 1 MiB blocks rather than
+            # looping over small iter_content() chunks in Python
+            response.raw.decode_content = True
+            with open(filepath, 'wb') as f:
+                shutil.copyfileobj(response.raw, f, length=1024 * 1024)
+        finally:
+            response.close()
 
         return filename, None
 
@@ -1662,6 +1829,41 @@ def download_image(image_url: str, output_dir: Path, base_name: str, index: int)
         return None, str(e)
 
 
+def download_images_parallel(
+    image_urls: list[str],
+    output_dir: Path,
+    base_name: str,
+    max_workers: int = 8
+) -> list[tuple[Optional[str], Optional[str]]]:
+    """
+    Download several images concurrently over one shared session.
+
+    Images are numbered from 1 in list order, exactly as a serial loop over
+    download_image() would number them, and results come back in that order.
+
+    Returns:
+        List of (local_path, error_message) tuples, one per URL
+    """
+    if not image_urls:
+        return []
+    if not REQUESTS_AVAILABLE:
+        return [(None, "requests library not available")] * len(image_urls)
+
+    workers = max(1, min(max_workers, len(image_urls)))
+    with requests.Session() as session:
+        # Keep a pooled connection per worker so none of them has to reconnect
+        _mount_retrying_adapter(session, pool_maxsize=max(workers, 10))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(
+                lambda item: download_image(item[1], output_dir, base_name, item[0], session),
+                enumerate(image_urls, 1)
+            ))
+
+
+# Real words (2+ letters) for the reading-time estimate
+_READING_WORD_RE = re.compile(r'\b[a-zA-Z]{2,}\b')
+
+
 def calculate_reading_time(text: str, page_reading_time: int = None) -> int:
     """
     Calculate estimated reading time in minutes.
@@ -1678,9 +1880,7 @@ def calculate_reading_time(text: str, page_reading_time: int = None) -> int:
         return page_reading_time
 
     # Clean content: only count actual words, not garbage characters
-    # Use regex to find real words (2+ letters)
-    words = re.findall(r'\b[a-zA-Z]{2,}\b', text)
-    word_count = len(words)
+    word_count = len(_READING_WORD_RE.findall(text))
 
     # Average reading speed: 200-250 words per minute
     # Using 225 as a middle ground
@@ -1688,17 +1888,22 @@ def calculate_reading_time(text: str, page_reading_time: int = None) -> int:
     return minutes
 
 
+_FILENAME_UNSAFE_RE = re.compile(r'[<>:"/\\|?*]')
+_FILENAME_SEPARATOR_RE = re.compile(r'[:;]')
+_FILENAME_SPACING_RE = re.compile(r'[\s_]+')
+
+
 def sanitize_filename(text: str) -> str:
     """Sanitize text for use in filename."""
     if not text:
         return ""
 
     # Replace problematic characters
-    text = re.sub(r'[<>:"/\\|?*]', '', text)
+    text = _FILENAME_UNSAFE_RE.sub('', text)
     # Replace colons and other separators with dash
-    text = re.sub(r'[:;]', ' -', text)
+    text = _FILENAME_SEPARATOR_RE.sub(' -', text)
     # Replace multiple spaces/underscores with single space
-    text = re.sub(r'[\s_]+', ' ', text)
+    text = _FILENAME_SPACING_RE.sub(' ', text)
     # Remove leading/trailing spaces
     text = text.strip()
     # Limit length
@@ -1744,11 +1949,20 @@ def create_output_filename(metadata: dict[str, Any], url: str) -> str:
     return ' - '.join(parts) + '.md'
 
 
+_ISO_DATE_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})')
+
+
 def format_date(date_str: Optional[str]) -> Optional[str]:
     """Format date string to YYYY-MM-DD format."""
     if not date_str:
         return None
 
+    # Fast path: ISO 8601 (JSON-LD, OpenGraph, <time datetime>) already starts
+    # with the YYYY-MM-DD we want; skip the failing strptime attempts
+    match = _ISO_DATE_RE.match(date_str.strip())
+    if match:
+        return match.group(0)
+
     # Common date formats to try
     formats = [
         '%Y-%m-%dT%H:%M:%S%z',
@@ -1771,7 +1985,7 @@ def format_date(date_str: Optional[str]) -> Optional[str]:
             continue
 
     # Try to extract just a date with regex
-    match = re.search(r'(\d{4})-(\d{2})-(\d{2})', date_str)
+    match = _ISO_DATE_RE.search(date_str)
     if match:
         return match.group(0)
 
@@ -1846,6 +2060,58 @@ def generate_yaml_frontmatter(
     return '\n'.join(lines)
 
 
+# Patterns that indicate start of marketing/promotional content
+_MARKETING_PATTERNS = [
+    # Subscribe/newsletter patterns
+    r'^#+\s*subscribe',
+    r'^#+\s*sign\s*up',
+    r'^#+\s*join\s*(our|the)',
+    r'^#+\s*get\s*(our|the|updates)',
+    r'^#+\s*stay\s*(updated|informed|ahead)',
+    r'^#+\s*newsletter',
+    # Related content patterns
+    r'^#+\s*(related|more|other|similar)\s*(posts?|articles?|content|reading)',
+    r'^#+\s*you\s*(might|may)\s*(also\s*)?(like|enjoy)',
+    r'^#+\s*recommended',
+    r'^#+\s*from\s+the\s+(library|blog|archive)',
+    r'^#+\s*content\s+from',
+    r'^#+\s*(also|more)\s+on',
+    # CTA patterns
+    r'^#+\s*share\s+this',
+    r'^#+\s*follow\s+us',
+    r'^#+\s*connect\s+with',
+    r'^#+\s*about\s+the\s+author',  # Usually at the very end
+    # Specific promotional text
+    r'^\*?do you have.*share with our community',
+    r'^\*?join our contributor',
+    r'^\*?we want to hear from you',
+    # Medium responses/comments section
+    r'^#+?\s*responses?\s*\(\d+\)',  # "Responses (2)" or "## Responses (5)"
+    r'^responses?\s*\(\d+\)',  # Plain "Responses (2)" without heading
+    r'^\*?\*?responses?\*?\*?\s*\(\d+\)',  # Bold responses header
+    # Medium promotional CTA patterns (paragraph text, not headers)
+    r'subscribe\s+here\.?\s*$',  # "Subscribe here." at end of line
+    r'(million|thousand)\s+people\s+have\s+(used|read)',  # "X million people have used/read"
+    r'Work with the best (designers|developers)',  # Medium/Crew promotional text
+    # Comment/response patterns (when they appear as text)
+    r'^BRAVO!',  # Common comment exclamations
+    r'^Well said',
+    r'^Thank YOU',
+    r'^I (very much )?(appreciate|agree|love)',
+]
+
+# The patterns above fused into two alternations, so each line is scanned
+# twice instead of once per pattern. Line-start patterns share one leading
+# anchor; inside a plain alternation every alternative would be retried at
+# every position of the line.
+_MARKETING_LINE_START_RE = re.compile(
+    '^(?:' + '|'.join(p[1:] for p in _MARKETING_PATTERNS if p.startswith('^')) + ')', re.I
+)
+_MARKETING_ANYWHERE_RE = re.compile(
+    '|'.join(f'(?:{p})' for p in _MARKETING_PATTERNS if not p.startswith('^')), re.I
+)
+
+
 def remove_marketing_content(content: str) -> str:
     """
     Remove marketing, promotional, and related content sections from article.
@@ -1855,56 +2121,12 @@ def remove_marketing_content(content: str) -> str:
     clean_lines = []
     skip_rest = False
 
-    # Patterns that indicate start of marketing/promotional content
-    marketing_patterns = [
-        # Subscribe/newsletter patterns
-        r'^#+\s*subscribe',
-        r'^#+\s*sign\s*up',
-        r'^#+\s*join\s*(our|the)',
-        r'^#+\s*get\s*(our|the|updates)',
-        r'^#+\s*stay\s*(updated|informed|ahead)',
-        r'^#+\s*newsletter',
-        # Related content patterns
-        r'^#+\s*(related|more|other|similar)\s*(posts?|articles?|content|reading)',
-        r'^#+\s*you\s*(might|may)\s*(also\s*)?(like|enjoy)',
-        r'^#+\s*recommended',
-        r'^#+\s*from\s+the\s+(library|blog|archive)',
-        r'^#+\s*content\s+from',
-        r'^#+\s*(also|more)\s+on',
-        # CTA patterns
-        r'^#+\s*share\s+this',
-        r'^#+\s*follow\s+us',
-        r'^#+\s*connect\s+with',
-        r'^#+\s*about\s+the\s+author',  # Usually at the very end
-        # Specific promotional text
-        r'^\*?do you have.*share with our community',
-        r'^\*?join our contributor',
-        r'^\*?we want to hear from you',
-        # Medium responses/comments section
-        r'^#+?\s*responses?\s*\(\d+\)',  # "Responses (2)" or "## Responses (5)"
-        r'^responses?\s*\(\d+\)',  # Plain "Responses (2)" without heading
-        r'^\*?\*?responses?\*?\*?\s*\(\d+\)',  # Bold responses header
-        # Medium promotional CTA patterns (paragraph text, not headers)
-        r'subscribe\s+here\.?\s*$',  # "Subscribe here." at end of line
-        r'(million|thousand)\s+people\s+have\s+(used|read)',  # "X million people have used/read"
-        r'Work with the best (designers|developers)',  # Medium/Crew promotional text
-        # Comment/response patterns (when they appear as text)
-        r'^BRAVO!',  # Common comment exclamations
-        r'^Well said',
-        r'^Thank YOU',
-        r'^I (very much )?(appreciate|agree|love)',
-    ]
-
-    # Compile patterns
-    compiled_patterns = [re.compile(p, re.I) for p in marketing_patterns]
-
     for i, line in enumerate(lines):
         # Check if this line matches a marketing pattern
         if not skip_rest:
-            for pattern in compiled_patterns:
-                if pattern.search(line.strip()):
-                    skip_rest = True
-                    break
+            stripped = line.strip()
+            if _MARKETING_LINE_START_RE.match(stripped) or _MARKETING_ANYWHERE_RE.search(stripped):
+                skip_rest = True
 
         if not skip_rest:
             clean_lines.append(line)
@@ -1916,6 +2138,19 @@ def remove_marketing_content(content: str) -> str:
     return '\n'.join(clean_lines)
 
 
+# Cleanup passes for clean_markdown_for_rag()
+# Characters to drop: anything but tab/newline/CR, printable ASCII, and the BMP
+# from U+00A0 on minus the zero-width/format block U+2000-U+200F
+_GARBAGE_CHAR_RE = re.compile('[^\t\n\r\x20-\x7e\xa0-\u1fff\u2010-\uffff]')
+_REPEATED_CHAR_RE = re.compile(r'(.)\1{10,}')
+_WORD_CHAR_RE = re.compile(r'[a-zA-Z0-9]')
+_HEADING_GAP_RE = re.compile(r'([^\n])\n(#{1,6}\s)')
+_EMPTY_HEADING_RE = re.compile(r'^#{1,6}\s*$', re.MULTILINE)
+_EMPTY_LINK_RE = re.compile(r'\[([^\]]+)\]\(\s*\)')
+_ANCHOR_LINK_RE = re.compile(r'\[([^\]]+)\]\(#[^\)]*\)')
+_EMPTY_IMAGE_RE = re.compile(r'!\[\s*\]\([^\)]+\)')
+
+
 def clean_markdown_for_rag(content: str) -> str:
     """
     Clean and optimize markdown content for RAG systems.
@@ -1926,32 +2161,20 @@ def clean_markdown_for_rag(content: str) -> str:
     content = remove_marketing_content(content)
 
     # ===== Step 1: Remove garbage/non-printable characters =====
-    # Keep only printable ASCII and common Unicode, plus whitespace
-    cleaned_chars = []
-    for char in content:
-        code = ord(char)
-        # Keep: newline, tab, carriage return, and printable characters
-        if char in '\n\r\t':
-            cleaned_chars.append(char)
-        elif code >= 0x20 and code < 0x7F:  # Printable ASCII
-            cleaned_chars.append(char)
-        elif code >= 0xA0 and code < 0x10000:  # Common Unicode (Latin, symbols, etc.)
-            # Filter out certain problematic Unicode ranges
-            if not (0x2000 <= code <= 0x200F):  # Zero-width and format chars
-                cleaned_chars.append(char)
-        # Drop everything else (control chars, private use, etc.)
-    content = ''.join(cleaned_chars)
+    # Keep only printable ASCII and common Unicode, plus whitespace; drop
+    # control chars, zero-width/format chars and everything beyond the BMP
+    content = _GARBAGE_CHAR_RE.sub('', content)
 
     # ===== Step 2: Remove repeated garbage patterns =====
     # Pattern like "aaa" or "xxx" repeated more than 3 times
-    content = re.sub(r'(.)\1{10,}', r'\1\1\1', content)
+    content = _REPEATED_CHAR_RE.sub(r'\1\1\1', content)
 
     # Remove lines that are mostly non-word characters (garbage lines)
     clean_lines = []
     for line in content.split('\n'):
         if line.strip():
             # Count word characters vs total
-            word_chars = len(re.findall(r'[a-zA-Z0-9]', line))
+            word_chars = len(_WORD_CHAR_RE.findall(line))
             total_chars = len(line.strip())
             # Keep line if at least 30% are word characters, or if it's short (headers, bullets)
             if total_chars < 5 or (word_chars / total_chars) >= 0.3:
@@ -1962,23 +2185,23 @@ def clean_markdown_for_rag(content: str) -> str:
 
     # ===== Step 3: Standard markdown cleanup =====
     # Remove excessive blank lines
-    content = re.sub(r'\n{3,}', '\n\n', content)
+    content = _MULTI_NEWLINE_RE.sub('\n\n', content)
 
     # Remove trailing whitespace from lines
     content = '\n'.join(line.rstrip() for line in content.split('\n'))
 
     # Fix heading spacing (ensure blank line before headings)
-    content = re.sub(r'([^\n])\n(#{1,6}\s)', r'\1\n\n\2', content)
+    content = _HEADING_GAP_RE.sub(r'\1\n\n\2', content)
 
     # Remove empty headings
-    content = re.sub(r'^#{1,6}\s*$', '', content, flags=re.MULTILINE)
+    content = _EMPTY_HEADING_RE.sub('', content)
 
     # Clean up link artifacts
-    content = re.sub(r'\[([^\]]+)\]\(\s*\)', r'\1', content)  # Empty links
-    content = re.sub(r'\[([^\]]+)\]\(#[^\)]*\)', r'\1', content)  # Anchor-only links
+    content = _EMPTY_LINK_RE.sub(r'\1', content)  # Empty links
+    content = _ANCHOR_LINK_RE.sub(r'\1', content)  # Anchor-only links
 
     # Remove image placeholders with no real content
-    content = re.sub(r'!\[\s*\]\([^\)]+\)', '', content)
+    content = _EMPTY_IMAGE_RE.sub('', content)
 
     # ===== Step 4: Clean up HTML entities and finalize =====
     # Clean up any remaining HTML entities
@@ -2250,8 +2473,8 @@ def convert_reddit_to_markdown(
         image_dir.mkdir(parents=True, exist_ok=True)
         base_name = sanitize_filename(f"{metadata.get('author', 'Reddit')} - {metadata.get('title', 'Post')[:40]} - Reddit")
         downloaded = 0
-        for idx, img_url in enumerate(image_urls, 1):
-            local_name, _err = download_image(img_url, image_dir, base_name, idx)
+        results = download_images_parallel(image_urls, image_dir, base_name)
+        for idx, (img_url, (local_name, _err)) in enumerate(zip(image_urls, results), 1):
             if local_name:
                 downloaded += 1
                 new_ref = f"{article_image_dir}/{local_name}"
@@ -2382,11 +2605,13 @@ def convert_url_to_markdown(
     # Step 2: Extract metadata from multiple sources
     print("\n[2/6] Extracting metadata...")
 
-    # Extract metadata from multiple sources
-    json_ld_meta = extract_json_ld_metadata(html_content)
-    og_meta = extract_opengraph_metadata(html_content)
-    spa_meta = extract_spa_metadata(html_content, url)  # SPA-specific extraction
-    html_meta = extract_html_metadata(html_content, url)
+    # Extract metadata from multiple sources. The extractors only read the
+    # tree, so parse the page once and share it instead of once per extractor.
+    soup = BeautifulSoup(html_content, _HTML_PARSER)
+    json_ld_meta = extract_json_ld_metadata(html_content, soup)
+    og_meta = extract_opengraph_metadata(html_content, soup)
+    spa_meta = extract_spa_metadata(html_content, url, soup)  # SPA-specific extraction
+    html_meta = extract_html_metadata(html_content, url, soup)
 
     # Merge metadata (priority: JSON-LD > OpenGraph > SPA > HTML)
     metadata = merge_metadata(json_ld_meta, og_meta, spa_meta, html_meta)
@@ -2413,7 +2638,7 @@ def convert_url_to_markdown(
                     print(f"      Note: Using username '{formatted_name}' from URL (display name not found)")
 
     # Extract tags/topics (also check SPA metadata for tags)
-    tags = extract_tags_and_topics(html_content)
+    tags = extract_tags_and_topics(html_content, soup)
     if not tags and 'tags' in spa_meta:
         tags = spa_meta['tags']
 
@@ -2476,8 +2701,9 @@ def convert_url_to_markdown(
         # Gather images from every captured page, de-duplicating by URL.
         all_images = []
         seen_image_urls = set()
-        for page_html in page_htmls:
-            for img in extract_images(page_html, url):
+        for page_num, page_html in enumerate(page_htmls):
+            # page_htmls[0] is html_content, already parsed above
+            for img in extract_images(page_html, url, soup if page_num == 0 else None):
                 if img['url'] not in seen_image_urls:
                     seen_image_urls.add(img['url'])
                     all_images.append(img)
@@ -2487,7 +2713,7 @@ def convert_url_to_markdown(
         # so we can't rely on URL-in-content matching
         article_images = []
         for img in all_images:
-            img_url = img['url']
+            img_url_lower = img['url'].lower()
             img_alt = (img.get('alt') or '').lower()
 
             # Always include priority images (og:image)
@@ -2500,7 +2726,7 @@ def convert_url_to_markdown(
                 continue
 
             # Skip tiny tracking/spacer images by URL pattern
-            if any(p in img_url.lower() for p in ['1x1', 'pixel', 'tracking', 'beacon', 'stat.']):
+            if any(p in img_url_lower for p in ['1x1', 'pixel', 'tracking', 'beacon', 'stat.']):
                 continue
 
             article_images.append(img)
@@ -2518,8 +2744,8 @@ def convert_url_to_markdown(
             base_name = sanitize_filename(f"{metadata.get('author', 'Unknown')} - {metadata.get('title', 'Article')[:40]} - {metadata.get('source_name', 'Web')}")
 
             downloaded = 0
-            for idx, img in enumerate(article_images, 1):
-                local_name, err = download_image(img['url'], image_dir, base_name, idx)
+            results = download_images_parallel([img['url'] for img in article_images], image_dir, base_name)
+            for idx, (img, (local_name, err)) in enumerate(zip(article_images, results), 1):
                 if local_name:
                     downloaded += 1
                     # Update content to reference local image
@@ -269,6 +269,27 @@ def test_engine_none_serialized_verbatim(gui_mod, monkeypatch):
     assert data["issues_filed"] == 0
 
 
+# --------------------------------------------------------------------------- #
+# Incremental polling: ?since=N returns only the new progress lines
+# --------------------------------------------------------------------------- #
+
+def test_status_since_returns_progress_delta(gui_mod, monkeypatch):
+    gui = gui_mod
+    client = gui.app.test_client()
+    gui.conversion_status["progress"].extend(["one", "two", "three"])
+
+    full = client.get("/status").get_json()
+    assert full["progress"] == ["one", "two", "three"]       # unchanged shape
+    assert "progress_len" not in full
+
+    delta = client.get("/status?since=2").get_json()
+    assert delta["progress"] == ["three"] and delta["progress_len"] == 3
+    assert gui.conversion_status["progress"] == ["one", "two", "three"]
+
+    caught_up = client.get("/status?since=3").get_json()
+    assert caught_up["progress"] == [] and caught_up["progress_len"] == 3
+
+
 # --------------------------------------------------------------------------- #
 # Per-source status: EPUB and PDF runs cannot clobber each other
 # --------------------------------------------------------------------------- #
@@ -297,6 +318,36 @@ def test_rag_status_is_per_source(gui_mod, monkeypatch):
     assert epub["cost_usd"] == pytest.approx(1.23)               # marker survived
 
 
+def test_overlapping_runs_capture_their_own_output(gui_mod):
+    """Concurrent workers' prints land in their own status dict, and an
+    exception inside the block still ends the capture."""
+    gui = gui_mod
+    epub, url = gui._job_status(), gui._job_status()
+    both_inside = threading.Barrier(2)
+
+    def worker(status, tag):
+        with gui._capture_output(status):
+            print(f"{tag} start")
+            both_inside.wait(timeout=5)
+            print(f"{tag} end")
+
+    threads = [threading.Thread(target=worker, args=(epub, "epub")),
+               threading.Thread(target=worker, args=(url, "url"))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=10)
+
+    assert [line.strip() for line in epub["progress"]] == ["epub start", "epub end"]
+    assert [line.strip() for line in url["progress"]] == ["url start", "url end"]
+
+    with pytest.raises(RuntimeError):
+        with gui._capture_output(epub):
+            raise RuntimeError("converter crashed")
+    print("after the run")
+    assert "after the run" not in "".join(epub["progress"])
+
+
 # --------------------------------------------------------------------------- #
 # Overlap guards: the 409 covers the whole run including post-steps
 # --------------------------------------------------------------------------- #
@@ -343,6 +394,45 @@ def test_convert_pdf_409_while_running(gui_mod, monkeypatch):
     assert resp.status_code == 409
 
 
+def test_convert_url_409_while_running(gui_mod, monkeypatch):
+    gui = gui_mod
+    monkeypatch.setattr(gui, "HTML_CONVERTER_AVAILABLE", True)
+    monkeypatch.setattr(gui, "url_conversion_status", gui._job_status())
+
+    converting, hold = threading.Event(), threading.Event()
+
+    def fake_convert(**kwargs):
+        converting.set()
+        hold.wait(10)
+        return True, "Successfully converted", None
+
+    monkeypatch.setattr(gui, "convert_url_to_markdown", fake_convert, raising=False)
+    # The running check and the status reset must happen under one lock, or
+    # two requests arriving together could both pass the guard
+    reset_under_lock = []
+    real_job_status = gui._job_status
+
+    def job_status(running=False):
+        reset_under_lock.append(gui._url_conversion_start_lock.locked())
+        return real_job_status(running)
+
+    monkeypatch.setattr(gui, "_job_status", job_status)
+    client = gui.app.test_client()
+
+    resp = client.post("/convert_url", json={"url": "https://example.com/a"})
+    assert resp.status_code == 200
+    try:
+        assert converting.wait(5)
+        resp2 = client.post("/convert_url", json={"url": "https://example.com/b"})
+        assert resp2.status_code == 409
+        assert reset_under_lock == [True]
+    finally:
+        hold.set()
+    assert _wait(lambda: gui.url_conversion_status["completed"])
+    assert client.post("/convert_url", json={"url": "https://example.com/c"}).status_code == 200
+    assert _wait(lambda: gui.url_conversion_status["completed"])
+
+
 # --------------------------------------------------------------------------- #
 # Template contract tripwires for the JS-side fixes (not unit-testable as JS)
 # --------------------------------------------------------------------------- #
@@ -359,6 +449,9 @@ def test_template_js_contracts():
     # Completion re-renders the main log so Copy Logs captures the cost line.
     assert "async function refreshMainLog" in html
     assert "refreshMainLog(suffix)" in html
+    # Main-log pollers fetch only the lines past what they've rendered.
+    assert "'/status?since='" in html
+    assert "'/pdf_status?since='" in html
 
 
 # --------------------------------------------------------------------------- #
@@ -441,3 +534,20 @@ def test_proxy_delegates_cancel_to_run_status(gui_mod):
     assert proxy.get("cancel") is True                       # delegated, not stale
     proxy["chunk"] = 3                                       # passthrough still works
     assert run_status["chunk"] == 3
+
+
+# --------------------------------------------------------------------------- #
+# Preferences file: atomic save keeps normal permissions
+# --------------------------------------------------------------------------- #
+
+@pytest.mark.skipif(sys.platform == "win32", reason="POSIX permission bits")
+def test_first_preferences_save_honours_umask(gui_mod):
+    gui = gui_mod
+    prefs = Path(gui.PREFERENCES_FILE)
+    assert not prefs.exists()
+    assert gui.save_preferences({"a": 1}) is True
+    assert prefs.stat().st_mode & 0o777 == 0o666 & ~gui._UMASK
+
+    prefs.chmod(0o640)
+    assert gui.save_preferences({"a": 2}) is True
+    assert prefs.stat().st_mode & 0o777 == 0o640                 # existing mode kept
@@ -63,10 +63,20 @@ class _FakeResponse:
         self.content = text.encode('utf-8')
         self.encoding = 'utf-8'
         self.apparent_encoding = 'utf-8'
+        self.closed = False
 
     def raise_for_status(self):
         pass
 
+    def close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
 
 def test_fetch_url_retries_without_verification_on_ssl_error(monkeypatch):
     """A site with a broken cert chain should still convert via a no-verify retry."""
@@ -106,3 +116,75 @@ def test_fetch_url_ssl_error_message_is_not_connectivity(monkeypatch):
 
     assert content is None
     assert "SSL" in error and "internet connection" not in error
+
+
+def test_fetch_url_refuses_oversized_page_before_reading_body(monkeypatch):
+    import requests
+
+    import html_to_md_converter as h
+
+    class _HugeResponse(_FakeResponse):
+        @property
+        def content(self):
+            raise AssertionError("body must not be read")
+
+        @content.setter
+        def content(self, value):
+            pass
+
+    resp = _HugeResponse("")
+    resp.headers = {'Content-Length': str(h.MAX_PAGE_BYTES + 1)}
+    seen = {}
+
+    def fake_get(self, url, **kwargs):
+        seen.update(kwargs)
+        return resp
+
+    monkeypatch.setattr(requests.Session, "get", fake_get)
+    content, error = h.fetch_url("https://example.com/video.mp4")
+
+    assert content is None
+    assert "too large" in error
+    assert seen.get('stream') is True
+    assert resp.closed
+
+
+def test_fetch_url_closes_streamed_response_on_http_error(monkeypatch):
+    import requests
+
+    import html_to_md_converter as h
+
+    class _ErrorResponse(_FakeResponse):
+        reason = "Internal Server Error"
+
+        def raise_for_status(self):
+            raise requests.exceptions.HTTPError(response=self)
+
+    resp = _ErrorResponse("")
+    resp.status_code = 500
+    monkeypatch.setattr(requests.Session, "get", lambda self, url, **kwargs: resp)
+    content, error = h.fetch_url("https://example.com/broken")
+
+    assert content is None
+    assert error == "HTTP error: 500 - Internal Server Error"
+    assert resp.closed
+
+
+def test_fetch_url_session_retries_only_transient_gateway_errors(monkeypatch):
+    import requests
+
+    import html_to_md_converter as h
+
+    sessions = []
+
+    def fake_get(self, url, **kwargs):
+        sessions.append(self)
+        return _FakeResponse("<html><body><p>ok</p></body></html>")
+
+    monkeypatch.setattr(requests.Session, "get", fake_get)
+    h.fetch_url("https://example.com/article")
+
+    retry = sessions[0].get_adapter("https://example.com/article").max_retries
+    assert set(retry.status_forcelist) == {502, 503, 504}
+    assert retry.connect == 0 and retry.read == 0
+    assert retry.raise_on_status is False
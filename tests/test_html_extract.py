@@ -0,0 +1,101 @@
+"""Unit tests for the BeautifulSoup-based web-article extractors."""
+
+import pytest
+
+import html_to_md_converter as h
+
+pytestmark = pytest.mark.skipif(not h.BS4_AVAILABLE, reason="beautifulsoup4 not installed")
+
+
+@pytest.mark.skipif(not h.LXML_AVAILABLE, reason="lxml not installed")
+def test_unclosed_paragraphs_keep_following_structure():
+    # An unclosed <p> implicitly ends at the next block element; the stdlib
+    # parser nested the rest of the page inside it and flattened it to one line.
+    md = h.html_to_simple_markdown(
+        "<p>First para<p>Second para</p><h2>Heading</h2><ul><li>one</li><li>two</li></ul>"
+    )
+    assert md == "First para\n\nSecond para\n\n## Heading\n\n- one\n- two"
+
+
+def test_metadata_extractors_read_meta_and_json_ld():
+    page = (
+        '<html><head><title>Fallback | Site</title>'
+        '<meta property="og:title" content="OG Title">'
+        '<meta name="keywords" content="alpha, beta">'
+        '<script type="application/ld+json">'
+        '{"@type": "Article", "headline": "LD Title", "author": {"name": "Ann Lee"}}'
+        '</script></head><body><h1>Page Heading</h1></body></html>'
+    )
+    assert h.extract_json_ld_metadata(page) == {"title": "LD Title", "author": "Ann Lee"}
+    assert h.extract_opengraph_metadata(page)["title"] == "OG Title"
+    assert h.extract_tags_and_topics(page) == ["alpha", "beta"]
+    assert h.extract_html_metadata(page, "https://www.example.com/post")["title"] == "Page Heading"
+
+
+@pytest.mark.skipif(not h.REQUESTS_AVAILABLE, reason="requests not installed")
+def test_parallel_image_downloads_keep_serial_numbering(monkeypatch, tmp_path):
+    import time
+
+    def fake_download(url, output_dir, base_name, index, session=None):
+        # Earlier images finish last, so completion order is reversed
+        time.sleep(0.01 * (4 - index))
+        return f"{base_name} - Figure {index}.png", None
+
+    monkeypatch.setattr(h, "download_image", fake_download)
+    urls = ["https://cdn.example.com/a.png", "https://cdn.example.com/b.png", "https://cdn.example.com/c.png"]
+    results = h.download_images_parallel(urls, tmp_path, "Post")
+    assert results == [(f"Post - Figure {i}.png", None) for i in (1, 2, 3)]
+    assert h.download_images_parallel([], tmp_path, "Post") == []
+
+
+def test_simple_markdown_inline_and_code_blocks():
+    md = h.html_to_simple_markdown(
+        '<div><b>bold</b> and <a href="https://x.test/">link</a> with <code>tick</code></div>'
+        '<pre><code class="language-py">a = 1\n b</code></pre>'
+        '<ol><li>first</li><li>second</li></ol>'
+    )
+    assert md == (
+        "**bold** and [link](https://x.test/) with `tick`\n\n"
+        "```py\na = 1\n b\n```\n\n1. first\n2. second"
+    )
+
+
+def test_json_ld_blocks_are_decoded_once_per_soup(monkeypatch):
+    page = (
+        '<script type="application/ld+json">{"@type": "Article", "headline": "LD Title", "keywords": "alpha, beta"}</script>'
+        '<script type="application/ld+json">not json</script>'
+    )
+    soup = h.BeautifulSoup(page, h._HTML_PARSER)
+    real_loads = h.json.loads
+    calls = []
+    monkeypatch.setattr(h.json, "loads", lambda s: calls.append(s) or real_loads(s))
+
+    assert h.extract_json_ld_metadata(page, soup) == {"title": "LD Title"}
+    assert h.extract_tags_and_topics(page, soup) == ["alpha", "beta"]
+    assert len(calls) == 2  # one per <script>, shared by both extractors
+
+
+def test_simple_markdown_decodes_entities_once():
+    md = h.html_to_simple_markdown("<p>Tom &amp; Jerry</p><p>Write &amp;lt;b&amp;gt; for bold</p>")
+    assert md == "Tom & Jerry\n\nWrite &lt;b&gt; for bold"
+
+
+def test_extract_images_finds_meta_uppercase_img_and_background_images():
+    html = ('<html><head><meta property="og:image" content="https://cdn.example.com/og.png"></head>'
+            '<body><div style="Background-Image: url(/hero.jpg)">Hi</div><IMG SRC="/fig.png"></body></html>')
+    urls = [img['url'] for img in h.extract_images(html, "https://example.com/post/")]
+    assert urls == ["https://cdn.example.com/og.png", "https://example.com/fig.png", "https://example.com/hero.jpg"]
+
+    no_images = '<html><body><p>Just text</p></body></html>'
+    assert h.extract_images(no_images, "https://example.com/") == []
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("2021-07-21T10:20:30.123Z", "2021-07-21"),
+    (" 2021-07-21T10:20:30+02:00", "2021-07-21"),
+    ("March 5, 2020", "2020-03-05"),
+    ("03/05/2020", "2020-03-05"),
+    ("not a date", "not a date"),
+])
+def test_format_date(raw, expected):
+    assert h.format_date(raw) == expected
@@ -12,19 +12,25 @@ Layers, fastest/most-portable first:
    so an autonomous fix cannot weaken the gate to make itself pass.
 """
 
+import importlib.util
 import json
+import os
 import shutil
 import subprocess
+import sys
 
 import pytest
 
+import epub_to_md_converter
 from epub_to_md_converter import (
     analyze_artifacts,
+    apply_aggressive_cleanup,
     calculate_optimization_score,
+    clean_markdown_for_claude,
     collect_quality_signals,
     process_folder,
 )
-from tests.conftest import BASELINES_PATH, find_corpus_epub
+from tests.conftest import BASELINES_PATH, build_synthetic_epub, find_corpus_epub
 
 CLEAN_MD = """---
 title: "Clean Book"
@@ -89,6 +95,65 @@ def test_optimization_score_bounds():
     assert 0.0 <= calculate_optimization_score(analyze_artifacts(huge)) <= 100.0
 
 
+def test_html_block_lines_removed_like_line_filter():
+    # The cleanup drops "``{=html}" marker lines exactly as filtering the
+    # split lines and re-joining them would, including at document edges.
+    for md in ("``{=html}\n``{=html}\nkeep\n", "a\n  ``{=html}\t\nb", "a\n``{=html}", "x ``{=html}\n"):
+        expected = "\n".join(line for line in md.split("\n") if line.strip() != "``{=html}")
+        assert apply_aggressive_cleanup(md, analyze_artifacts(md)) == expected
+
+
+@pytest.mark.parametrize("md, expected", [
+    # Anchor removed first, then the fence line it was hiding: the blank line
+    # between the paragraphs survives.
+    ("text\n[]{#a}::: booksection\nmore\n", "text\n\nmore\n"),
+    ("x\n{#x}:::\ny\n", "x\n\ny\n"),
+    # Removing []{#id} exposes a {#id} that the next pass removes.
+    ("{#[]{#a}x}", ""),
+    # Divs are removed before comments, even a div that starts inside one.
+    ("a\n<!-- x <div> -->\ny\n</div>\nb\n", "a\n<!-- x\nb\n"),
+])
+def test_claude_cleanup_passes_run_in_sequence(md, expected):
+    # Expected values are the output of the original one-pattern-per-pass
+    # cleanup; each input is one where a fused alternation would differ.
+    assert clean_markdown_for_claude(md) == expected
+
+
+# C0 controls, the \x1c-\x1f separators stdlib re counts as \s, Unicode
+# spaces, and digits newer than some Unicode tables.
+_ODD_CHARS = [chr(c) for c in range(0x21)] + [
+    "\x85", "\xa0", "\u1680", "\u2000", "\u200a", "\u2028", "\u2029",
+    "\u202f", "\u205f", "\u3000", "\ufeff", "\u0663", "\U00010d40",
+]
+
+
+@pytest.mark.skipif(not epub_to_md_converter.REGEX_AVAILABLE, reason="regex package not installed")
+def test_regex_engine_cleanup_matches_stdlib_re(monkeypatch):
+    # Load a second copy of the converter with `regex` unavailable, so every
+    # _compile_fast pattern falls back to stdlib re, and compare the outputs.
+    spec = importlib.util.spec_from_file_location("_epub_stdlib_re", epub_to_md_converter.__file__)
+    stdlib_only = importlib.util.module_from_spec(spec)
+    with monkeypatch.context() as m:
+        m.setitem(sys.modules, "regex", None)
+        spec.loader.exec_module(stdlib_only)
+    assert not stdlib_only.REGEX_AVAILABLE
+
+    for c in _ODD_CHARS:
+        md = (
+            f"#{c}Title {{#id}}\n##{c}[]{{#a}}Rest\n###{c}[]{c}\n#{c}[1{c}2] Intro\n"
+            f"See [\\[{c}\\]](#n1){{.ref}} and [\\[3{c}\\]](#n2){{.ref}}.\n"
+            f"> ::: {{}}{c}\n> :::{c}\n:::{c}x\n\n{c}\n\n\n"
+            f"[[cite{c}](#c){{.x}}] ![a{c}](b.png){{width=1}}\n"
+        )
+        for module in (epub_to_md_converter, stdlib_only):
+            assert module.analyze_artifacts(md) == stdlib_only.analyze_artifacts(md), repr(c)
+        artifacts = stdlib_only.analyze_artifacts(md)
+        assert epub_to_md_converter.apply_aggressive_cleanup(md, artifacts) == \
+            stdlib_only.apply_aggressive_cleanup(md, artifacts), repr(c)
+        assert epub_to_md_converter.clean_markdown_for_claude(md) == \
+            stdlib_only.clean_markdown_for_claude(md), repr(c)
+
+
 # --------------------------------------------------------------------------- #
 # 2. End-to-end synthetic conversion (always run; real pipeline gate)
 # --------------------------------------------------------------------------- #
@@ -114,6 +179,39 @@ def test_gate_has_teeth(synthetic_epub):
     assert regressed_score < clean_score - 5, "oracle failed to penalize injected artifacts"
 
 
+def test_parallel_batch_matches_serial(tmp_path):
+    """The process-pool path must convert every book, in input order, to the same Markdown."""
+    src = tmp_path / "src"
+    src.mkdir()
+    for name in ("a.epub", "b.epub"):
+        build_synthetic_epub(str(src / name))
+
+    def outputs(pairs):
+        texts = []
+        for _, md_path in pairs:
+            with open(md_path, encoding="utf-8") as f:
+                texts.append([line for line in f if not line.startswith("processed_date:")])
+        return texts
+
+    serial = process_folder(str(src), str(tmp_path / "serial"), max_workers=1)
+    parallel = process_folder(str(src), str(tmp_path / "parallel"), max_workers=2)
+    assert [e for e, _ in parallel] == [e for e, _ in serial]
+    assert len(parallel) == 2
+    assert outputs(parallel) == outputs(serial)
+
+
+def test_folder_scan_matches_epub_files_case_insensitively(tmp_path):
+    """Upper-case .EPUB files are converted; folders and other files are not."""
+    src = tmp_path / "src"
+    src.mkdir()
+    build_synthetic_epub(str(src / "upper.EPUB"))
+    (src / "unpacked.epub").mkdir()
+    (src / "cover.jpg").write_bytes(b"")
+
+    pairs = process_folder(str(src), str(tmp_path / "out"), max_workers=1)
+    assert [os.path.basename(e) for e, _ in pairs] == ["upper.EPUB"]
+
+
 # --------------------------------------------------------------------------- #
 # 3. Corpus floors/ceilings (skipped when EPUBs absent)
 # --------------------------------------------------------------------------- #